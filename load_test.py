@@ -0,0 +1,422 @@
+#!/usr/bin/env python3
+"""
+Load-test harness for the dashboard data path.
+Simulates N scanner-station browsers running index.html fetchData() against an http.server
+serving a local copy of test.json, second.json and shipped.json, then reports latency
+percentiles, throughput, bytes served and server CPU so serving-layer changes can be compared.
+
+Server CPU is measured with psutil (pip install psutil). Without it, CPU can only be read
+from /proc on Linux, so on Windows it is reported as not measured.
+"""
+
+import argparse
+import http.client
+import json
+import logging
+import math
+import os
+import random
+import shutil
+import socket
+import ssl
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from urllib.parse import urljoin, urlsplit
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+# Files requested by fetchData() in index.html, in the same order
+DASHBOARD_FILES = ["test.json", "second.json", "shipped.json"]
+
+# fetchData() throws if either of these is not ok; shipped.json is allowed to fail
+REQUIRED_FILES = ["test.json", "second.json"]
+
+def setup_logging():
+    """Configure logging for the application"""
+    log_format = "%(asctime)s - %(levelname)s - %(message)s"
+    logging.basicConfig(
+        level=logging.INFO,
+        format=log_format,
+        handlers=[
+            logging.StreamHandler()
+        ]
+    )
+
+def find_free_port():
+    """Ask the OS for an unused local port"""
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def copy_datasets(source_dir, target_dir):
+    """Copy the served JSON datasets into the directory the test server will serve"""
+    copied = []
+    for filename in DASHBOARD_FILES:
+        source = os.path.join(source_dir, filename)
+        if not os.path.exists(source):
+            logging.warning(f"{filename} not found in {source_dir}, server will return 404 for it")
+            continue
+        shutil.copy2(source, os.path.join(target_dir, filename))
+        copied.append(f"{filename} ({os.path.getsize(source)} bytes)")
+    logging.info(f"Copied datasets: {', '.join(copied) if copied else 'none'}")
+
+def start_server(serve_dir, port):
+    """Start python -m http.server in a subprocess, the same way start_network_serverf.bat does"""
+    process = subprocess.Popen(
+        [sys.executable, "-m", "http.server", str(port), "--bind", "127.0.0.1", "--directory", serve_dir],
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+    )
+
+    # Wait for the server to accept connections
+    deadline = time.time() + 10
+    while time.time() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"http.server exited early with code {process.returncode}")
+        try:
+            with socket.create_connection(("127.0.0.1", port), timeout=0.5):
+                return process
+        except OSError:
+            time.sleep(0.1)
+
+    process.terminate()
+    raise RuntimeError(f"http.server did not start listening on port {port}")
+
+def read_process_cpu_seconds(pid):
+    """Return total user+system CPU seconds used by a process, or None if it cannot be measured"""
+    if psutil is not None:
+        try:
+            cpu = psutil.Process(pid).cpu_times()
+            return cpu.user + cpu.system
+        except psutil.Error:
+            return None
+
+    # Fall back to /proc on Linux when psutil is not installed
+    try:
+        with open(f"/proc/{pid}/stat", "r") as stat_file:
+            # Fields after the ")" of the command name; utime and stime are fields 14 and 15
+            fields = stat_file.read().rsplit(")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, IndexError, ValueError):
+        return None
+
+def can_measure_cpu():
+    """True if server CPU can be read, either through psutil or /proc"""
+    return psutil is not None or os.path.exists("/proc/self/stat")
+
+def fetch_file(scheme, host, port, path, timeout, ssl_context=None):
+    """GET a single file and return (status, bytes read, latency in seconds, error)"""
+    start = time.perf_counter()
+    if scheme == "https":
+        connection = http.client.HTTPSConnection(host, port, timeout=timeout, context=ssl_context)
+    else:
+        connection = http.client.HTTPConnection(host, port, timeout=timeout)
+    try:
+        connection.request("GET", path, headers={"Cache-Control": "no-cache"})
+        response = connection.getresponse()
+        body = response.read()
+        return response.status, len(body), time.perf_counter() - start, None
+    except Exception as e:
+        return None, 0, time.perf_counter() - start, str(e)
+    finally:
+        connection.close()
+
+def percentile(sorted_values, pct):
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return None
+    rank = max(1, math.ceil(pct / 100.0 * len(sorted_values)))
+    return sorted_values[min(rank, len(sorted_values)) - 1]
+
+class LoadStats:
+    """Thread-safe collector for per-request and per-refresh results"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.request_latencies = {filename: [] for filename in DASHBOARD_FILES}
+        self.refresh_latencies = []
+        self.failed_refreshes = 0
+        self.client_exceptions = 0
+        self.bytes_received = 0
+        self.requests = 0
+        self.errors = 0
+        self.optional_failures = 0
+        self.status_counts = {}
+        self.error_messages = {}
+
+    def record_request(self, filename, status, size, latency, error):
+        """Record one response; returns True if it was a 2xx, the same check as response.ok"""
+        ok = error is None and 200 <= status < 300
+        with self.lock:
+            self.requests += 1
+            self.bytes_received += size
+            key = str(status) if error is None else "error"
+            self.status_counts[key] = self.status_counts.get(key, 0) + 1
+            if error is not None:
+                self.error_messages[error] = self.error_messages.get(error, 0) + 1
+            if ok:
+                self.request_latencies[filename].append(latency)
+            elif filename in REQUIRED_FILES:
+                self.errors += 1
+            else:
+                # fetchData() tolerates a failed shipped.json, so keep it out of errors
+                self.optional_failures += 1
+        return ok
+
+    def record_refresh(self, latency):
+        with self.lock:
+            self.refresh_latencies.append(latency)
+
+    def record_failed_refresh(self):
+        with self.lock:
+            self.failed_refreshes += 1
+
+    def record_client_exception(self):
+        with self.lock:
+            self.client_exceptions += 1
+
+def run_client(client_id, scheme, host, port, paths, interval, jitter, timeout, ssl_context, stop_event, executor, stats):
+    """Simulate one dashboard browser: fetch all files in parallel, then wait for the next refresh"""
+    # Stagger start-up so clients do not all refresh in lock-step
+    if stop_event.wait(random.uniform(0, interval)):
+        return
+
+    while not stop_event.is_set():
+        refresh_start = time.perf_counter()
+
+        try:
+            # Mirror Promise.all([...]) in fetchData()
+            futures = {
+                filename: executor.submit(fetch_file, scheme, host, port, paths[filename], timeout, ssl_context)
+                for filename in DASHBOARD_FILES
+            }
+            results = {filename: stats.record_request(filename, *future.result()) for filename, future in futures.items()}
+
+            refresh_time = time.perf_counter() - refresh_start
+            if all(results[filename] for filename in REQUIRED_FILES):
+                stats.record_refresh(refresh_time)
+                logging.debug(f"Client {client_id} refresh took {refresh_time * 1000:.1f} ms")
+            else:
+                stats.record_failed_refresh()
+                logging.debug(f"Client {client_id} refresh failed after {refresh_time * 1000:.1f} ms")
+        except Exception as e:
+            # Keep the client running so one bad refresh does not silently shrink the load
+            refresh_time = time.perf_counter() - refresh_start
+            stats.record_client_exception()
+            logging.error(f"Client {client_id} refresh raised an exception: {str(e)}", exc_info=True)
+
+        wait_time = max(0, interval + random.uniform(-jitter, jitter) - refresh_time)
+        stop_event.wait(wait_time)
+
+def summarise_latencies(latencies):
+    """Build a p50/p95/p99/max summary in milliseconds"""
+    sorted_values = sorted(latencies)
+    summary = {"count": len(sorted_values)}
+    for name, pct in (("p50", 50), ("p95", 95), ("p99", 99), ("max", 100)):
+        value = percentile(sorted_values, pct)
+        summary[f"{name}_ms"] = round(value * 1000, 2) if value is not None else None
+    return summary
+
+def build_report(args, stats, elapsed, cpu_seconds):
+    """Collect the results of a run into a JSON-serialisable report"""
+    report = {
+        "timestamp": datetime.now().isoformat(),
+        "url": args.url,
+        "clients": args.clients,
+        "interval_seconds": args.interval,
+        "duration_seconds": round(elapsed, 2),
+        "requests": stats.requests,
+        "errors": stats.errors,
+        "optional_failures": stats.optional_failures,
+        "status_counts": stats.status_counts,
+        "error_messages": stats.error_messages,
+        "requests_per_second": round(stats.requests / elapsed, 2) if elapsed else None,
+        "bytes_served": stats.bytes_received,
+        "megabytes_per_second": round(stats.bytes_received / elapsed / 1_000_000, 3) if elapsed else None,
+        "failed_refreshes": stats.failed_refreshes,
+        "client_exceptions": stats.client_exceptions,
+        "refresh_latency": summarise_latencies(stats.refresh_latencies),
+        "file_latency": {filename: summarise_latencies(values) for filename, values in stats.request_latencies.items()},
+        "server_cpu_seconds": None,
+        "server_cpu_percent": None,
+    }
+    if cpu_seconds is not None:
+        report["server_cpu_seconds"] = round(cpu_seconds, 2)
+        report["server_cpu_percent"] = round(cpu_seconds / elapsed * 100, 1) if elapsed else None
+    return report
+
+def format_summary(summary):
+    """Format a latency summary as a single log line"""
+    if not summary["count"]:
+        return "no successful samples"
+    return (f"p50 {summary['p50_ms']} ms, p95 {summary['p95_ms']} ms, "
+            f"p99 {summary['p99_ms']} ms, max {summary['max_ms']} ms ({summary['count']} samples)")
+
+def log_report(report):
+    """Print the report in the same banner style as the other scripts"""
+    logging.info("=" * 60)
+    logging.info("LOAD TEST RESULTS")
+    logging.info("=" * 60)
+    logging.info(f"Target: {report['url']}")
+    logging.info(f"Clients: {report['clients']}, refresh every {report['interval_seconds']}s, "
+                 f"ran for {report['duration_seconds']}s")
+    logging.info(f"Requests: {report['requests']} ({report['requests_per_second']} req/s), "
+                 f"errors: {report['errors']}, status codes: {report['status_counts']}")
+    for message, count in report["error_messages"].items():
+        logging.info(f"   {count}x {message}")
+    logging.info(f"Optional file failures (shipped.json, tolerated by fetchData()): {report['optional_failures']}")
+    logging.info(f"Bytes served: {report['bytes_served']} ({report['megabytes_per_second']} MB/s)")
+    logging.info(f"Failed refreshes (test.json or second.json not ok): {report['failed_refreshes']}")
+    if report["client_exceptions"]:
+        logging.warning(f"Client exceptions (see errors above): {report['client_exceptions']}")
+    logging.info(f"fetchData() refresh latency: {format_summary(report['refresh_latency'])}")
+    for filename, summary in report["file_latency"].items():
+        logging.info(f"   {filename}: {format_summary(summary)}")
+    if report["server_cpu_seconds"] is not None:
+        logging.info(f"Server CPU: {report['server_cpu_seconds']}s ({report['server_cpu_percent']}% of one core)")
+    else:
+        logging.info("Server CPU: not measured (external server, or psutil/procfs unavailable)")
+    logging.info("=" * 60)
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Simulate concurrent dashboard clients polling the JSON data files")
+    parser.add_argument("--clients", type=int, default=20, help="number of simulated dashboard browsers (default: 20)")
+    parser.add_argument("--interval", type=float, default=120, help="seconds between refreshes per client (default: 120, same as the polling script)")
+    parser.add_argument("--jitter", type=float, default=None, help="random +/- seconds added to each interval (default: 10%% of --interval)")
+    parser.add_argument("--duration", type=float, default=300, help="how long to run the test in seconds (default: 300)")
+    parser.add_argument("--timeout", type=float, default=30, help="per-request timeout in seconds (default: 30)")
+    parser.add_argument("--url", default=None, help="dashboard URL on an already running server, e.g. http://localhost:5500/index.html; if omitted a local http.server is started")
+    parser.add_argument("--insecure", action="store_true", help="skip certificate verification for https:// targets with self-signed certificates")
+    parser.add_argument("--server-pid", type=int, default=None, help="PID of the external server to measure CPU for when using --url")
+    parser.add_argument("--data-dir", default=".", help="directory containing the datasets to copy for the local server (default: current directory)")
+    parser.add_argument("--allow-missing", action="store_true", help="run even if test.json or second.json is missing from --data-dir")
+    parser.add_argument("--output", default=None, help="write the results as JSON to this file for later comparison")
+    parser.add_argument("--verbose", action="store_true", help="log every client refresh")
+    args = parser.parse_args()
+
+    if args.clients < 1:
+        parser.error("--clients must be at least 1")
+    if args.interval <= 0:
+        parser.error("--interval must be greater than 0")
+    if args.jitter is not None and args.jitter < 0:
+        parser.error("--jitter cannot be negative")
+    if args.duration <= 0:
+        parser.error("--duration must be greater than 0")
+    if args.timeout <= 0:
+        parser.error("--timeout must be greater than 0")
+
+    if args.url is not None:
+        parts = urlsplit(args.url)
+        if parts.scheme not in ("http", "https") or not parts.hostname:
+            parser.error(f"--url must be an http:// or https:// URL with a host, got {args.url!r}")
+        try:
+            parts.port
+        except ValueError as e:
+            parser.error(f"--url has an invalid port: {e}")
+
+    # Without these every refresh fails in fetchData(), so the numbers would be meaningless
+    if args.url is None and not args.allow_missing:
+        missing = [filename for filename in REQUIRED_FILES if not os.path.exists(os.path.join(args.data_dir, filename))]
+        if missing:
+            parser.error(f"{', '.join(missing)} not found in {args.data_dir} (use --allow-missing to run anyway)")
+
+    return args
+
+def main():
+    setup_logging()
+    args = parse_args()
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+    if args.jitter is None:
+        args.jitter = args.interval * 0.1
+
+    if not can_measure_cpu():
+        logging.warning("psutil is not installed and /proc is unavailable, so server CPU will not be measured. "
+                        "Run 'pip install psutil' to enable it.")
+
+    serve_dir = None
+    server_process = None
+    server_pid = args.server_pid
+
+    try:
+        if args.url is None:
+            serve_dir = tempfile.mkdtemp(prefix="dashboard_load_test_")
+            copy_datasets(args.data_dir, serve_dir)
+            port = find_free_port()
+            server_process = start_server(serve_dir, port)
+            server_pid = server_process.pid
+            args.url = f"http://127.0.0.1:{port}"
+            logging.info(f"Started http.server (pid {server_pid}) serving {serve_dir} on {args.url}")
+
+        target = urlsplit(args.url)
+        host = target.hostname
+        port = target.port or (443 if target.scheme == "https" else 80)
+        # Resolve each file against the page URL the way fetch('test.json') does in the browser,
+        # so both http://host:5500/ and http://host:5500/index.html work
+        paths = {filename: urlsplit(urljoin(args.url, filename)).path for filename in DASHBOARD_FILES}
+
+        # The internal services use self-signed certificates, same as picking_request.py works around
+        ssl_context = ssl._create_unverified_context() if args.insecure else None
+
+        logging.info(f"Starting {args.clients} clients against {args.url} for {args.duration}s "
+                     f"(refresh every {args.interval}s +/- {args.jitter:.1f}s)")
+
+        stats = LoadStats()
+        stop_event = threading.Event()
+        cpu_start = read_process_cpu_seconds(server_pid) if server_pid else None
+        start_time = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=args.clients * len(DASHBOARD_FILES)) as executor:
+            clients = [
+                threading.Thread(
+                    target=run_client,
+                    args=(i, target.scheme, host, port, paths, args.interval, args.jitter, args.timeout, ssl_context, stop_event, executor, stats),
+                    daemon=True,
+                )
+                for i in range(args.clients)
+            ]
+            for client in clients:
+                client.start()
+
+            try:
+                stop_event.wait(args.duration)
+            except KeyboardInterrupt:
+                logging.info("Received keyboard interrupt, stopping clients...")
+            stop_event.set()
+            for client in clients:
+                client.join()
+
+        elapsed = time.perf_counter() - start_time
+        cpu_end = read_process_cpu_seconds(server_pid) if server_pid else None
+        cpu_seconds = cpu_end - cpu_start if cpu_start is not None and cpu_end is not None else None
+
+        report = build_report(args, stats, elapsed, cpu_seconds)
+        log_report(report)
+
+        if args.output:
+            with open(args.output, "w") as outfile:
+                json.dump(report, outfile, indent=4)
+            logging.info(f"Results written to {args.output}")
+
+        # An empty report must not look like a passing run to scripts comparing before/after results
+        if not stats.refresh_latencies:
+            logging.error("No refresh succeeded during the run, results are not usable for comparison")
+            sys.exit(1)
+
+    finally:
+        if server_process is not None:
+            server_process.terminate()
+            server_process.wait()
+        if serve_dir is not None:
+            shutil.rmtree(serve_dir, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()